@@ -125,10 +125,19 @@ class Config:
                 'kms_key_id': os.getenv('AWS_KMS_KEY_ID'),
                 'key_rotation_interval': int(os.getenv('KEY_ROTATION_INTERVAL', '90')),
             },
+            'validation': {
+                'skip': bool(int(os.getenv('STORAGE_SKIP_VALIDATION', '0'))),
+            },
             'retention': {
                 'enabled': bool(int(os.getenv('RETENTION_ENABLED', '1'))),
                 'period_days': int(os.getenv('RETENTION_PERIOD_DAYS', '2555')),
             },
+            'batch_operations': {
+                'account_id': os.getenv('AWS_ACCOUNT_ID'),
+                'role_arn': os.getenv('S3_BATCH_ROLE_ARN'),
+                'manifest_prefix': os.getenv('S3_BATCH_MANIFEST_PREFIX', 'batch-operations/manifests/'),
+                'report_prefix': os.getenv('S3_BATCH_REPORT_PREFIX', 'batch-operations/reports/'),
+            },
             'backup': {
                 'enabled': bool(int(os.getenv('BACKUP_ENABLED', '1'))),
                 'frequency': os.getenv('BACKUP_FREQUENCY', 'daily'),
@@ -104,17 +104,18 @@ class Document(BaseModel):
             raise ValueError(f"Invalid status: {new_status}")
 
         old_status = self.status
+        now = datetime.now(timezone.utc)
         self.status = new_status
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now
 
         if new_status == APPLICATION_STATUS.COMPLETED:
-            self.processed_at = datetime.now(timezone.utc)
+            self.processed_at = now
         elif new_status == APPLICATION_STATUS.FAILED:
             self.failure_reason = reason
 
         # Record in audit log
         self.audit_log.append({
-            'timestamp': datetime.now(timezone.utc),
+            'timestamp': now,
             'action': 'status_update',
             'old_value': old_status,
             'new_value': new_status,
@@ -133,11 +134,12 @@ class Document(BaseModel):
         # Merge with existing metadata
         old_metadata = self.metadata.copy()
         self.metadata.update(new_metadata)
-        self.updated_at = datetime.now(timezone.utc)
+        now = datetime.now(timezone.utc)
+        self.updated_at = now
 
         # Record in audit log
         self.audit_log.append({
-            'timestamp': datetime.now(timezone.utc),
+            'timestamp': now,
             'action': 'metadata_update',
             'old_value': old_metadata,
             'new_value': self.metadata,
@@ -4,6 +4,7 @@ and monitoring features.
 
 External Dependencies:
 numpy==1.24.0
+hyperscan==0.4.0
 logging (built-in)
 re (built-in)
 """
@@ -11,8 +12,10 @@ re (built-in)
 import numpy as np
 import logging
 import re
+import threading
+import hyperscan
 from datetime import datetime, timezone
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 
 from ...core.ocr_engine import OCREngine
 from ...core.text_extractor import TextExtractor
@@ -28,6 +31,19 @@ FIELD_PATTERNS = {
     'micr_line': r'^[A-Z0-9\s⑈⑆]+$'
 }
 
+# Precompiled patterns for single-match scans
+MICR_LINE_RE = re.compile(FIELD_PATTERNS['micr_line'])
+BANK_NAME_RE = re.compile(FIELD_PATTERNS['bank_name'])
+CHECK_NUMBER_RE = re.compile(FIELD_PATTERNS['check_number'])
+INVALID_FIELD_CHAR_RE = re.compile(r'[^A-Za-z0-9\s\-\.]')
+
+# Fields located in raw OCR text, prefiltered in a single multi-pattern scan
+SCAN_FIELDS = ('micr_line', 'bank_name', 'check_number')
+
+# Hyperscan's UCP \s omits the \x1c-\x1f separators Python's \s matches; every \s in
+# the scanned patterns sits inside a character class, so widen those classes explicitly
+SCAN_EXPRESSIONS = [FIELD_PATTERNS[field].replace(r'\s', r'\s\x1c-\x1f').encode() for field in SCAN_FIELDS]
+
 # Confidence threshold for voided check processing
 CONFIDENCE_THRESHOLD = 0.95
 
@@ -65,6 +81,18 @@ class VoidedCheckProcessor:
             'max_retries': config.get('max_retries', MAX_RETRIES)
         }
         
+        # Compile multi-pattern scan database; per-thread scratch is cloned on first scan
+        self._hs_db = hyperscan.Database()
+        self._hs_db.compile(
+            expressions=SCAN_EXPRESSIONS,
+            ids=list(range(len(SCAN_FIELDS))),
+            elements=len(SCAN_FIELDS),
+            flags=[hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP |
+                   hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH] * len(SCAN_FIELDS)
+        )
+        self._hs_scratch = hyperscan.Scratch(self._hs_db)
+        self._hs_local = threading.local()
+        
         # Initialize processing metrics
         self._processing_metrics = {
             'total_processed': 0,
@@ -83,57 +111,108 @@ class VoidedCheckProcessor:
             image: Input image as numpy array
 
         Returns:
-            Dictionary containing extracted banking information with confidence scores
+            Dictionary containing extracted banking information with confidence scores,
+            or 'error' and 'validation_results' entries when validation fails
         """
-        start_time = datetime.now(timezone.utc)
         self._logger.info(f"Starting voided check processing for document {document.id}")
 
         try:
-            # Update document status
-            document.update_status('PROCESSING')
+            result, confidence, duration = self._process_document(document, image)
 
-            # Validate input image
-            preprocessed_image = self._ocr_engine.preprocess_image(image)
+            # Update processing metrics
+            self._update_metrics([confidence], [duration])
 
-            # Extract text with confidence scoring
-            text, confidence, metrics = self._ocr_engine.extract_text(
-                preprocessed_image,
-                enhance_preprocessing=True
-            )
+            return result
 
-            # Extract banking information
-            banking_info = self.extract_banking_info(text, self._validation_rules['confidence_threshold'])
+        except Exception as e:
+            self._logger.error(f"Error processing voided check: {str(e)}")
+            document.update_status('FAILED', str(e))
+            self._processing_metrics['failed'] += 1
+            raise
 
-            # Validate extracted fields
-            is_valid, validation_message, validation_results = self.validate_fields(banking_info)
+    def process_batch(self, items: List[Tuple[Document, np.ndarray]]) -> List[Dict[str, Any]]:
+        """
+        Processes a batch of voided check documents, sharing per-call setup and
+        updating processing metrics once for the whole batch.
 
-            # Update document metadata
-            document.update_metadata({
-                'processing_metrics': metrics,
-                'validation_results': validation_results,
-                'confidence_score': confidence,
-                'processing_duration': (datetime.now(timezone.utc) - start_time).total_seconds()
-            })
+        Args:
+            items: List of (document, image) pairs to process
 
-            # Update document status based on validation
-            if is_valid:
-                document.update_status('COMPLETED')
-                self._processing_metrics['successful'] += 1
-            else:
-                document.update_status('FAILED', validation_message)
+        Returns:
+            List of results in input order; failed documents yield an 'error' entry
+        """
+        self._logger.info(f"Starting voided check batch processing for {len(items)} documents")
+
+        results = []
+        confidences = []
+        durations = []
+        for document, image in items:
+            try:
+                result, confidence, duration = self._process_document(document, image)
+                results.append(result)
+                confidences.append(confidence)
+                durations.append(duration)
+            except Exception as e:
+                self._logger.error(f"Error processing voided check {document.id}: {str(e)}")
+                document.update_status('FAILED', str(e))
                 self._processing_metrics['failed'] += 1
+                results.append({'error': str(e)})
 
-            # Update processing metrics
-            self._update_metrics(confidence, start_time)
+        # Update processing metrics once per batch
+        self._update_metrics(confidences, durations)
 
-            # Sanitize sensitive data before returning
-            return sanitize_sensitive_data(banking_info, document.security_context['encryption_key'])
+        return results
 
-        except Exception as e:
-            self._logger.error(f"Error processing voided check: {str(e)}")
-            document.update_status('FAILED', str(e))
+    def _process_document(self, document: Document,
+                          image: np.ndarray) -> Tuple[Dict[str, Any], float, float]:
+        """
+        Runs OCR, extraction and validation for a single document.
+
+        Returns:
+            Tuple of (result, OCR confidence, processing duration in seconds)
+        """
+        start_time = datetime.now(timezone.utc)
+
+        # Update document status
+        document.update_status('PROCESSING')
+
+        # Validate input image
+        preprocessed_image = self._ocr_engine.preprocess_image(image)
+
+        # Extract text with confidence scoring
+        text, confidence, metrics = self._ocr_engine.extract_text(
+            preprocessed_image,
+            enhance_preprocessing=True
+        )
+
+        # Extract banking information
+        banking_info = self.extract_banking_info(text, self._validation_rules['confidence_threshold'])
+
+        # Validate extracted fields
+        is_valid, validation_message, validation_results = self.validate_fields(banking_info)
+
+        # Update document metadata
+        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        document.update_metadata({
+            'processing_metrics': metrics,
+            'validation_results': validation_results,
+            'confidence_score': confidence,
+            'processing_duration': duration
+        })
+
+        # Update document status based on validation
+        if not is_valid:
+            document.update_status('FAILED', validation_message)
             self._processing_metrics['failed'] += 1
-            raise
+            # Nothing usable to return, so skip encrypting the extracted fields
+            return {'error': validation_message, 'validation_results': validation_results}, confidence, duration
+
+        document.update_status('COMPLETED')
+        self._processing_metrics['successful'] += 1
+
+        # Sanitize sensitive data before returning
+        return (sanitize_sensitive_data(banking_info, document.security_context['encryption_key']),
+                confidence, duration)
 
     def validate_fields(self, extracted_data: Dict[str, Any]) -> Tuple[bool, str, Dict[str, Any]]:
         """
@@ -201,9 +280,11 @@ class VoidedCheckProcessor:
         banking_info = {}
         
         try:
+            # Single pass to find which fields can match at all
+            candidate_fields = self._scan_candidate_fields(text)
+
             # Extract MICR line data
-            micr_matches = re.finditer(self._validation_rules['patterns']['micr_line'], text)
-            micr_data = next(micr_matches, None)
+            micr_data = MICR_LINE_RE.search(text) if 'micr_line' in candidate_fields else None
             
             if micr_data:
                 micr_text = micr_data.group()
@@ -219,13 +300,12 @@ class VoidedCheckProcessor:
                     banking_info['account_number'] = account_matches.group(1)
 
             # Extract bank name using pattern
-            bank_matches = re.finditer(self._validation_rules['patterns']['bank_name'], text)
-            bank_names = [match.group() for match in bank_matches]
-            if bank_names:
-                banking_info['bank_name'] = bank_names[0]
+            bank_match = BANK_NAME_RE.search(text) if 'bank_name' in candidate_fields else None
+            if bank_match:
+                banking_info['bank_name'] = bank_match.group()
 
             # Extract check number if available
-            check_matches = re.search(self._validation_rules['patterns']['check_number'], text)
+            check_matches = CHECK_NUMBER_RE.search(text) if 'check_number' in candidate_fields else None
             if check_matches:
                 banking_info['check_number'] = check_matches.group()
 
@@ -241,6 +321,25 @@ class VoidedCheckProcessor:
             self._logger.error(f"Error extracting banking information: {str(e)}")
             raise
 
+    def _scan_candidate_fields(self, text: str) -> set:
+        """
+        Returns the scan fields whose patterns may match the text. Hyperscan runs in
+        prefilter mode, which may report extra candidates but not miss matches of
+        SCAN_EXPRESSIONS; exact values still come from re.
+        """
+        # Scratch space is not reentrant, so each thread scans with its own clone
+        scratch = getattr(self._hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = self._hs_scratch.clone()
+
+        candidate_fields = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            candidate_fields.add(SCAN_FIELDS[pattern_id])
+
+        self._hs_db.scan(text.encode(), match_event_handler=on_match, scratch=scratch)
+        return candidate_fields
+
     def _validate_routing_number(self, routing_number: str) -> bool:
         """
         Validates routing number using ABA routing number checksum algorithm.
@@ -267,7 +366,8 @@ class VoidedCheckProcessor:
         base_confidence = 1.0
         
         # Reduce confidence for potential error patterns
-        if re.search(r'[^A-Za-z0-9\s\-\.]', value):
+        has_invalid_chars = INVALID_FIELD_CHAR_RE.search(value) is not None
+        if has_invalid_chars:
             base_confidence *= 0.8
             
         # Adjust confidence based on length
@@ -276,15 +376,18 @@ class VoidedCheckProcessor:
             
         return round(base_confidence, 2)
 
-    def _update_metrics(self, confidence: float, start_time: datetime) -> None:
+    def _update_metrics(self, confidences: List[float], durations: List[float]) -> None:
         """
         Updates processing metrics with latest results.
         """
-        processing_time = (datetime.now(timezone.utc) - start_time).total_seconds()
-        self._processing_metrics['total_processed'] += 1
-        self._processing_metrics['processing_times'].append(processing_time)
+        if not confidences:
+            return
+
+        previous_total = self._processing_metrics['total_processed']
+        self._processing_metrics['total_processed'] += len(confidences)
+        self._processing_metrics['processing_times'].extend(durations)
         
         # Update average confidence
-        total_confidence = (self._processing_metrics['average_confidence'] * 
-                          (self._processing_metrics['total_processed'] - 1) + confidence)
+        total_confidence = (self._processing_metrics['average_confidence'] * previous_total +
+                          sum(confidences))
         self._processing_metrics['average_confidence'] = total_confidence / self._processing_metrics['total_processed']
\ No newline at end of file
@@ -12,10 +12,11 @@ REQUIRED_MERCHANT_FIELDS = ['business_name', 'ein', 'address', 'owner_info']
 REQUIRED_FINANCIAL_FIELDS = ['monthly_revenue', 'bank_account', 'routing_number']
 MIN_OCR_CONFIDENCE = 0.85
 SENSITIVE_FIELD_PATTERNS = {
-    'ssn': r'^\d{3}-\d{2}-\d{4}$',
-    'ein': r'^\d{2}-\d{7}$',
-    'bank_account': r'^\d{8,17}$'
+    'ssn': re.compile(r'^\d{3}-\d{2}-\d{4}$'),
+    'ein': re.compile(r'^\d{2}-\d{7}$'),
+    'bank_account': re.compile(r'^\d{8,17}$')
 }
+SENSITIVE_FIELD_NAMES = re.compile(r'ssn|ein|account|routing', re.IGNORECASE)
 VALIDATION_THRESHOLDS = {
     'min_revenue': 1000.00,
     'max_revenue': 10000000.00,
@@ -72,7 +73,7 @@ def validate_document_data(extracted_data: Dict[str, Any],
         
         # Validate account numbers
         if 'account_number' in extracted_data:
-            if not re.match(SENSITIVE_FIELD_PATTERNS['bank_account'], extracted_data['account_number']):
+            if not SENSITIVE_FIELD_PATTERNS['bank_account'].match(extracted_data['account_number']):
                 errors.append("Invalid bank account number format")
 
     metadata['field_count'] = len(extracted_data)
@@ -111,7 +112,7 @@ def validate_merchant_info(merchant_data: Dict[str, Any]) -> Tuple[bool, List[st
 
     # Validate EIN
     if 'ein' in merchant_data:
-        if not re.match(SENSITIVE_FIELD_PATTERNS['ein'], merchant_data['ein']):
+        if not SENSITIVE_FIELD_PATTERNS['ein'].match(merchant_data['ein']):
             errors.append("Invalid EIN format")
         metadata['fields_validated'].append('ein')
 
@@ -159,7 +160,7 @@ def validate_financial_data(financial_data: Dict[str, Any]) -> Tuple[bool, List[
 
     # Validate bank account information
     if 'bank_account' in financial_data:
-        if not re.match(SENSITIVE_FIELD_PATTERNS['bank_account'], financial_data['bank_account']):
+        if not SENSITIVE_FIELD_PATTERNS['bank_account'].match(financial_data['bank_account']):
             errors.append("Invalid bank account number")
             risk_assessment['flags'].append('invalid_account')
 
@@ -232,19 +233,19 @@ def sanitize_sensitive_data(data: Dict[str, Any], encryption_key: str) -> Dict[s
     fernet = Fernet(encryption_key.encode())
     sanitized_data = {}
     audit_log = []
+    now = datetime.now(timezone.utc)
 
     for field, value in data.items():
         # Check if field contains sensitive data
-        is_sensitive = any(pattern in field.lower() for pattern in ['ssn', 'ein', 'account', 'routing'])
-        
-        if is_sensitive:
+        if SENSITIVE_FIELD_NAMES.search(field):
             # Encrypt sensitive fields
-            encrypted_value = fernet.encrypt(str(value).encode()).decode()
+            plaintext = value.encode() if isinstance(value, str) else str(value).encode()
+            encrypted_value = fernet.encrypt(plaintext).decode()
             sanitized_data[field] = encrypted_value
             audit_log.append({
                 'field': field,
                 'action': 'encrypted',
-                'timestamp': datetime.now(timezone.utc)
+                'timestamp': now
             })
         else:
             # Copy non-sensitive fields as is
@@ -252,6 +253,6 @@ def sanitize_sensitive_data(data: Dict[str, Any], encryption_key: str) -> Dict[s
 
     # Add audit log to sanitized data
     sanitized_data['_audit'] = audit_log
-    sanitized_data['_sanitized_at'] = datetime.now(timezone.utc).isoformat()
+    sanitized_data['_sanitized_at'] = now.isoformat()
 
     return sanitized_data
\ No newline at end of file
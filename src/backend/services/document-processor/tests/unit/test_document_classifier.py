@@ -1,22 +1,86 @@
 import pytest
 import numpy as np
-from unittest.mock import Mock, patch
+from contextvars import ContextVar
+from unittest.mock import Mock
 from datetime import datetime, timezone
 from uuid import uuid4
 
 from ....shared.constants import DOCUMENT_TYPES, APPLICATION_STATUS
-from ../../src.core.document_classifier import DocumentClassifier, CONFIDENCE_THRESHOLD
-from ../../src.models.document import Document
+from ...src.core.document_classifier import DocumentClassifier, CONFIDENCE_THRESHOLD
+from ...src.models.document import Document
 
 # Test constants
 TEST_MODEL_PATH = "tests/data/test_model.h5"
 TEST_IMAGE_SIZE = (1000, 800)
 TEST_CONFIDENCE_THRESHOLD = 0.95
-VALID_DOCUMENT_TYPES = [t.value for t in DOCUMENT_TYPES]
-
-@pytest.fixture
-def mock_document():
-    """Fixture for creating a test document instance"""
+VALID_DOCUMENT_TYPES = frozenset(t.value for t in DOCUMENT_TYPES)
+
+# Seeded so every run and xdist worker draws identical data, only at import time
+_RNG = np.random.default_rng(seed=0xD0C5)
+
+# Shared read-only test image; pixel values are never inspected since OCR/ML are mocked
+_TEST_IMAGE = _RNG.integers(0, 255, TEST_IMAGE_SIZE, dtype=np.uint8)
+_TEST_IMAGE.setflags(write=False)
+
+# Canned mock responses, built once and shared read-only across tests
+_PROBA_BANK = np.array([[0.96, 0.02, 0.02]], dtype=np.float32)
+_PROBA_LOW = np.array([[0.4, 0.3, 0.3]], dtype=np.float32)
+_PROBA_CHECK = np.array([[0.05, 0.05, 0.90]], dtype=np.float32)
+for _proba in (_PROBA_BANK, _PROBA_LOW, _PROBA_CHECK):
+    _proba.setflags(write=False)
+# OCR metrics mirror the dict OCREngine.extract_text returns
+_OCR_BANK = (
+    "BANK STATEMENT",
+    0.98,
+    {"confidence_score": 0.98, "word_count": 2, "processing_attempts": 1, "enhancement_applied": True}
+)
+
+# Mock OCR/ML responses keyed by scenario; tests select one through _SCENARIO
+_SCENARIO = ContextVar("scenario", default=None)
+_OCR_RESPONSES = {
+    "bank_statement": (
+        """
+    BANK STATEMENT
+    Account Number: 1234567890
+    Statement Period: 01/01/2023 - 01/31/2023
+    Balance: $10,000.00
+    """,
+        0.98,
+        {"confidence_score": 0.98, "word_count": 20, "processing_attempts": 1, "enhancement_applied": True}
+    ),
+    "bank_summary": _OCR_BANK,
+    "low_confidence": (
+        "Unclear document content",
+        0.45,
+        {"confidence_score": 0.45, "word_count": 3, "processing_attempts": 1, "enhancement_applied": True}
+    ),
+    "voided_check": (
+        """
+    VOID
+    Pay to the order of: Test Company
+    Routing Number: 123456789
+    Account Number: 987654321
+    """,
+        0.97,
+        {"confidence_score": 0.97, "word_count": 15, "processing_attempts": 1, "enhancement_applied": True}
+    )
+}
+_PROBA_RESPONSES = {
+    "bank_statement": _PROBA_BANK,
+    "bank_summary": _PROBA_BANK,
+    "low_confidence": _PROBA_LOW,
+    "voided_check": _PROBA_CHECK
+}
+
+def _ocr_side_effect(image, **kwargs):
+    return _OCR_RESPONSES[_SCENARIO.get()]
+
+def _proba_side_effect(features):
+    return _PROBA_RESPONSES[_SCENARIO.get()]
+
+@pytest.fixture(scope="module")
+def document_template():
+    """Fixture for the test document all mock_document instances are copied from"""
     return Document(
         id=uuid4(),
         application_id=uuid4(),
@@ -27,46 +91,50 @@ def mock_document():
     )
 
 @pytest.fixture
+def mock_document(document_template):
+    """Fixture for creating a test document instance"""
+    return document_template.copy(deep=True)
+
+@pytest.fixture(scope="module")
 def mock_document_classifier():
     """Fixture for creating a DocumentClassifier instance with mocked dependencies"""
-    with patch('tensorflow.keras.models.load_model') as mock_load_model:
-        classifier = DocumentClassifier(
-            model_path=TEST_MODEL_PATH,
-            confidence_threshold=TEST_CONFIDENCE_THRESHOLD
-        )
-        return classifier
-
-@pytest.fixture
+    classifier = DocumentClassifier(
+        model_path=TEST_MODEL_PATH,
+        confidence_threshold=TEST_CONFIDENCE_THRESHOLD
+    )
+    # Responses are configured once here; tests pick theirs by setting _SCENARIO
+    classifier._ocr_engine = Mock()
+    classifier._ocr_engine.extract_text.side_effect = _ocr_side_effect
+    classifier._ml_model = Mock()
+    classifier._ml_model.predict_proba.side_effect = _proba_side_effect
+    return classifier
+
+@pytest.fixture(autouse=True)
+def reset_scenario():
+    """Fixture clearing the selected mock scenario after each test"""
+    token = _SCENARIO.set(None)
+    yield
+    _SCENARIO.reset(token)
+
+@pytest.fixture(scope="module")
 def test_image_data():
     """Fixture for creating test image data"""
-    return np.random.randint(0, 255, TEST_IMAGE_SIZE, dtype=np.uint8)
+    return _TEST_IMAGE
 
 @pytest.mark.unit
 def test_document_classifier_initialization(mock_document_classifier):
     """Test DocumentClassifier initialization and configuration"""
     assert mock_document_classifier._confidence_threshold == TEST_CONFIDENCE_THRESHOLD
     assert mock_document_classifier._document_patterns is not None
-    assert all(doc_type in mock_document_classifier._document_patterns 
-              for doc_type in VALID_DOCUMENT_TYPES)
+    assert VALID_DOCUMENT_TYPES.issubset(mock_document_classifier._document_patterns.keys())
     assert mock_document_classifier._ocr_engine is not None
     assert mock_document_classifier._ml_model is not None
 
 @pytest.mark.unit
 def test_classify_document_bank_statement(mock_document_classifier, mock_document, test_image_data):
     """Test successful classification of a bank statement document"""
-    # Mock OCR engine response
-    mock_ocr_text = """
-    BANK STATEMENT
-    Account Number: 1234567890
-    Statement Period: 01/01/2023 - 01/31/2023
-    Balance: $10,000.00
-    """
-    mock_document_classifier._ocr_engine.extract_text.return_value = (
-        mock_ocr_text, 0.98, {"word_count": 20}
-    )
-
-    # Mock ML model prediction
-    mock_document_classifier._ml_model.predict_proba.return_value = np.array([[0.96, 0.02, 0.02]])
+    # Bank statement OCR and ML responses
+    _SCENARIO.set("bank_statement")
 
     # Execute classification
     doc_type, confidence, metadata = mock_document_classifier.classify_document(
@@ -80,19 +148,14 @@ def test_classify_document_bank_statement(mock_document_classifier, mock_documen
     assert "ml_confidence" in metadata
     assert "pattern_confidence" in metadata
     assert "ocr_metrics" in metadata
+    assert metadata["ocr_metrics"]["enhancement_applied"]
     assert metadata["ensemble_confidence"] >= TEST_CONFIDENCE_THRESHOLD
 
 @pytest.mark.unit
 def test_classify_document_low_confidence(mock_document_classifier, mock_document, test_image_data):
     """Test classification behavior with low confidence scores"""
-    # Mock OCR engine response with low confidence
-    mock_ocr_text = "Unclear document content"
-    mock_document_classifier._ocr_engine.extract_text.return_value = (
-        mock_ocr_text, 0.45, {"word_count": 3}
-    )
-
-    # Mock ML model prediction with low confidence
-    mock_document_classifier._ml_model.predict_proba.return_value = np.array([[0.4, 0.3, 0.3]])
+    # Low confidence OCR and ML responses
+    _SCENARIO.set("low_confidence")
 
     # Verify classification raises appropriate error
     with pytest.raises(ValueError) as exc_info:
@@ -117,7 +180,7 @@ def test_extract_features(mock_document_classifier, test_image_data):
     assert isinstance(features, np.ndarray)
     assert features.dtype == np.float32
     assert len(features) > 0
-    assert all(isinstance(f, (int, float)) for f in features)
+    assert np.isfinite(features).all()
 
 @pytest.mark.unit
 def test_validate_classification():
@@ -153,19 +216,8 @@ def test_classify_document_invalid_image(mock_document_classifier, mock_document
 @pytest.mark.unit
 def test_classify_document_pattern_matching(mock_document_classifier, mock_document, test_image_data):
     """Test pattern-based validation in document classification"""
-    # Mock OCR engine response with specific patterns
-    mock_ocr_text = """
-    VOID
-    Pay to the order of: Test Company
-    Routing Number: 123456789
-    Account Number: 987654321
-    """
-    mock_document_classifier._ocr_engine.extract_text.return_value = (
-        mock_ocr_text, 0.97, {"word_count": 15}
-    )
-
-    # Mock ML model prediction
-    mock_document_classifier._ml_model.predict_proba.return_value = np.array([[0.05, 0.05, 0.90]])
+    # OCR response with voided check patterns
+    _SCENARIO.set("voided_check")
 
     # Execute classification
     doc_type, confidence, metadata = mock_document_classifier.classify_document(
@@ -182,11 +234,7 @@ def test_classify_document_pattern_matching(mock_document_classifier, mock_docum
 def test_document_metadata_update(mock_document_classifier, mock_document, test_image_data):
     """Test document metadata updates during classification"""
     # Mock successful classification
-    mock_ocr_text = "BANK STATEMENT"
-    mock_document_classifier._ocr_engine.extract_text.return_value = (
-        mock_ocr_text, 0.98, {"word_count": 2}
-    )
-    mock_document_classifier._ml_model.predict_proba.return_value = np.array([[0.96, 0.02, 0.02]])
+    _SCENARIO.set("bank_summary")
 
     # Perform classification
     mock_document_classifier.classify_document(test_image_data, mock_document)